@@ -1,25 +1,54 @@
 """ArXiv search tool for academic paper searching."""
 
 
-from typing import Any
+import asyncio
+import re
 
 import arxiv  # type: ignore
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from langchain_core.tools import BaseTool
+from pydantic import ConfigDict
+
+from agent.cache import TTLCache
+
+# Formatted results keyed on (query, max_results, start)
+_search_cache: TTLCache[str] = TTLCache(maxsize=512, ttl=90)
+
+# Largest page the arXiv API returns for a single request
+_ARXIV_MAX_PAGE_SIZE = 2000
+
+# arXiv titles and abstracts keep the line wrapping of the original submission
+_WS_RE = re.compile(r"\s+")
+
+# Output block for a single paper, filled once per result; summaries are cut
+# to 300 characters by the format spec while writing the output
+_PAPER_TMPL = (
+    "{idx}. **{title}**\n"
+    "   Authors: {authors}{more_authors}\n"
+    "   Published: {published}\n"
+    "   Categories: {categories}\n"
+    "   URL: {url}\n"
+    "   Summary: {summary:.300}...\n\n"
+)
 
 
 class ArxivSearchTool(BaseTool):
-    """Tool for searching academic papers on arXiv."""
+    """Tool for searching academic papers on arXiv.
+
+    Configure the default max_results and start position for pagination as
+    keyword arguments.
+    """
+
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
 
     name: str = "arxiv_search"
     description: str = "Search for academic papers on arXiv. Provide a search query, max_results (default 5), and start position (default 0) for pagination."
     max_results: int = 5
     start: int = 0
 
-    def __init__(self, max_results: int = 5, start: int = 0, **kwargs: Any) -> None:
-        """Initialize the ArxivSearchTool with maximum number of results to return and start position for pagination."""
-        super().__init__(max_results=max_results, start=start, **kwargs)
-
     def _run(
         self,
         query: str,
@@ -39,59 +68,82 @@ class ArxivSearchTool(BaseTool):
         max_results = max_results if max_results is not None else self.max_results
         start = start if start is not None else self.start
 
+        key = (query, max_results, start)
+        cached = _search_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            # Create a search client
-            client = arxiv.Client()
-
-            # For pagination, we need to request enough results to cover our offset + max_results
-            # We'll request a reasonable upper bound to ensure we have enough results
-            total_needed = start + max_results
-            # Request at least 50 results
-            search_max_results = max(total_needed, 50)
-
-            # Perform the search using built-in pagination
-            search = arxiv.Search(
-                query=query,
-                max_results=search_max_results,
-                sort_by=arxiv.SortCriterion.Relevance
-            )
-
-            results: list[dict[str, Any]] = []
-            # Use the built-in offset parameter for pagination and limit results manually
-            for paper in client.results(search, offset=start):
-                if len(results) >= max_results:
-                    break
-
-                paper_info = {
-                    "title": paper.title,
-                    "authors": [author.name for author in paper.authors],
-                    "summary": paper.summary,
-                    "published": paper.published.strftime("%Y-%m-%d"),
-                    "url": paper.entry_id,
-                    "categories": paper.categories
-                }
-                results.append(paper_info)
-
-            if not results:
-                return f"No papers found for query: {query}"
-
-            # Format the results as a readable string
-            formatted_results = f"Found {len(results)} papers for query: '{query}' (showing results {start + 1}-{start + len(results)})\n\n"
-
-            for i, paper in enumerate(results, 1):
-                # Show first 3 authors
-                authors_str = ", ".join(paper["authors"][:3])
-                if len(paper["authors"]) > 3:
-                    authors_str += " et al."
+            result = self._search(query, max_results, start)
+        except Exception as e:
+            return f"Error searching arXiv: {str(e)}"
 
-                formatted_results += f"{start + i}. **{paper['title']}**\n"
-                formatted_results += f"   Authors: {authors_str}\n"
-                formatted_results += f"   Published: {paper['published']}\n"
-                formatted_results += f"   Categories: {', '.join(paper['categories'])}\n"
-                formatted_results += f"   URL: {paper['url']}\n"
-                formatted_results += f"   Summary: {paper['summary'][:300]}...\n\n"
+        _search_cache.set(key, result)
+        return result
 
-            return formatted_results
+    async def _arun(
+        self,
+        query: str,
+        max_results: int | None = None,
+        start: int | None = None,
+        run_manager: AsyncCallbackManagerForToolRun | None = None
+    ) -> str:
+        """Execute the search asynchronously, coalescing identical concurrent queries."""
+        max_results = max_results if max_results is not None else self.max_results
+        start = start if start is not None else self.start
 
-        except Exception as e:
-            return f"Error searching arXiv: {str(e)}"
+        key = (query, max_results, start)
+        async with _search_cache.single_flight(key):
+            cached = _search_cache.get(key)
+            if cached is not None:
+                return cached
+            return await asyncio.to_thread(self._run, query, max_results, start)
+
+    def _search(self, query: str, max_results: int, start: int) -> str:
+        """Query arXiv and format the matching papers as a readable string."""
+        # Create a search client whose first page, fetched from the offset,
+        # already holds every requested result, so the client never pays its
+        # delay_seconds wait between page requests
+        client = arxiv.Client(
+            page_size=min(max_results, _ARXIV_MAX_PAGE_SIZE),
+            delay_seconds=3.0,
+            num_retries=3
+        )
+
+        # For pagination, we need to request enough results to cover our offset + max_results
+        total_needed = start + max_results
+
+        # Perform the search using built-in pagination
+        search = arxiv.Search(
+            query=query,
+            max_results=total_needed,
+            sort_by=arxiv.SortCriterion.Relevance
+        )
+
+        parts: list[str] = []
+        count = 0
+        # Use the built-in offset parameter for pagination and limit results manually,
+        # formatting each paper as it arrives instead of collecting them first
+        for paper in client.results(search, offset=start):
+            if count >= max_results:
+                break
+            count += 1
+
+            parts.append(_PAPER_TMPL.format_map({
+                "idx": start + count,
+                "title": _WS_RE.sub(" ", paper.title).strip(),
+                # Show first 3 authors
+                "authors": ", ".join(author.name for author in paper.authors[:3]),
+                "more_authors": " et al." if len(paper.authors) > 3 else "",
+                "published": paper.published.date().isoformat(),
+                "categories": ", ".join(paper.categories),
+                "url": paper.entry_id,
+                "summary": _WS_RE.sub(" ", paper.summary).strip(),
+            }))
+
+        if not count:
+            return f"No papers found for query: {query}"
+
+        # Format the results as a readable string
+        header = f"Found {count} papers for query: '{query}' (showing results {start + 1}-{start + count})\n\n"
+        return "".join([header, *parts])
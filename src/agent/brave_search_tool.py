@@ -1,24 +1,53 @@
 """Brave Search tool for web searching."""
 
 
-from typing import Any
+import asyncio
+import json
+from typing import Any, AsyncGenerator
 
+import httpx
 from langchain_community.tools import BraveSearch
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
 from langchain_core.tools import BaseTool
+from pydantic import ConfigDict, PrivateAttr
+
+from agent.cache import TTLCache
+
+try:
+    # Optional faster JSON parser, installed alongside langsmith
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+# Search results keyed on the query string
+_search_cache: TTLCache[str] = TTLCache(maxsize=512, ttl=90)
+
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
 
 
 class BraveSearchTool(BaseTool):
     """Tool for searching the web using Brave Search."""
 
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
+
     name: str = "brave_search"
     description: str = "Search the web using Brave Search. Provide a search query as input."
     api_key: str | None = None
 
-    def __init__(self, api_key: str | None = None, **kwargs: Any) -> None:
-        """Initialize the BraveSearchTool with an API key."""
-        super().__init__(api_key=api_key, **kwargs)
-        self._brave_search_tool = None
+    _brave_search_tool: BraveSearch | None = PrivateAttr(default=None)
+    # One pooled client per event loop, since its connections belong to the
+    # loop that opened them; each is held open by a lifetime generator
+    _async_clients: dict[
+        asyncio.AbstractEventLoop,
+        tuple[httpx.AsyncClient, AsyncGenerator[None, None]]
+    ] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context: Any) -> None:
+        """Create the Brave Search client once the API key has been validated."""
+        super().model_post_init(context)
         if self.api_key:
             self._brave_search_tool = BraveSearch.from_api_key(
                 api_key=self.api_key)
@@ -30,9 +59,109 @@ class BraveSearchTool(BaseTool):
     ) -> str:
         """Execute the search with the given query about any topic you can find in internet."""
         if self._brave_search_tool:
+            cached = _search_cache.get(query)
+            if cached is not None:
+                return cached
+
             result = self._brave_search_tool.run(query)
-            return str(result) if result is not None else "No search results found"
+            if result is None:
+                return "No search results found"
+
+            _search_cache.set(query, str(result))
+            return str(result)
         else:
             raise ValueError(
                 "API key for Brave Search is required to run this tool."
             )
+
+    async def _arun(
+        self,
+        query: str,
+        run_manager: AsyncCallbackManagerForToolRun | None = None
+    ) -> str:
+        """Execute the search asynchronously, coalescing identical concurrent queries."""
+        if not self.api_key:
+            raise ValueError(
+                "API key for Brave Search is required to run this tool."
+            )
+
+        async with _search_cache.single_flight(query):
+            cached = _search_cache.get(query)
+            if cached is not None:
+                return cached
+
+            result = await self._asearch(query, self.api_key)
+            _search_cache.set(query, result)
+            return result
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client used for async searches on the running loop."""
+        entry = self._async_clients.get(asyncio.get_running_loop())
+        if entry is not None:
+            await entry[1].aclose()
+
+    def _new_async_client(self) -> httpx.AsyncClient:
+        """Create the HTTP/2 client used for async searches."""
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the pooled client for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is not None:
+            return entry[0]
+
+        # Drop clients of loops that were closed without shutting down their
+        # async generators; their connections can no longer be used or closed
+        for stale in [other for other in self._async_clients if other.is_closed()]:
+            del self._async_clients[stale]
+
+        client = self._new_async_client()
+        lifetime = self._client_lifetime(loop, client)
+        # Starting the generator registers it with the loop, so asyncio.run
+        # (and any loop calling shutdown_asyncgens) closes the client for us
+        await anext(lifetime)
+        self._async_clients[loop] = (client, lifetime)
+        return client
+
+    async def _client_lifetime(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        client: httpx.AsyncClient
+    ) -> AsyncGenerator[None, None]:
+        """Keep client open until aclose() or the loop's shutdown closes this generator."""
+        try:
+            yield
+        finally:
+            self._async_clients.pop(loop, None)
+            await client.aclose()
+
+    async def _asearch(self, query: str, api_key: str) -> str:
+        """Query the Brave Search API directly, formatting results like BraveSearch.run."""
+        client = await self._get_async_client()
+        response = await client.get(
+            BRAVE_SEARCH_URL,
+            headers={
+                "X-Subscription-Token": api_key,
+                "Accept": "application/json",
+            },
+            params={"q": query, "extra_snippets": "true"}
+        )
+        if not response.is_success:
+            raise Exception(f"HTTP error {response.status_code}")
+
+        web_results = _json_loads(response.content).get("web", {}).get("results", [])
+        return json.dumps([
+            {
+                "title": item.get("title"),
+                "link": item.get("url"),
+                "snippet": " ".join(
+                    filter(None, [item.get("description"), *item.get("extra_snippets", [])])
+                ),
+            }
+            for item in web_results
+        ])
@@ -0,0 +1,71 @@
+"""In-process caching helpers for tool results.
+
+Search tools are often asked the same question several times in a row (an
+agent looping on a query, or several users hitting the same graph), so their
+results are kept for a short time-to-live.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+
+class TTLCache[V]:
+    """Least-recently-used cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 90.0) -> None:
+        """Initialize the cache with a maximum size and a time-to-live in seconds."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-key asyncio locks with their number of current holders/waiters
+        self._inflight: dict[Hashable, tuple[asyncio.Lock, int]] = {}
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._data.clear()
+
+    @asynccontextmanager
+    async def single_flight(self, key: Hashable) -> AsyncIterator[None]:
+        """Serialize concurrent async lookups for the same key.
+
+        Callers should check the cache inside this block, so that when several
+        identical requests arrive together only the first one does the work.
+        """
+        lock, waiters = self._inflight.get(key, (asyncio.Lock(), 0))
+        self._inflight[key] = (lock, waiters + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, waiters = self._inflight[key]
+            if waiters > 1:
+                self._inflight[key] = (lock, waiters - 1)
+            else:
+                del self._inflight[key]
@@ -5,12 +5,32 @@ parameters for the agent, including LLM settings, behavior limits, and
 system message customization.
 """
 
-from pydantic import BaseModel, Field
+import os
+
+from pydantic import BaseModel, ConfigDict, Field
+
+_DEFAULT_TOOL_CONCURRENCY_LIMIT = 4
+
+
+def _tool_concurrency_limit_from_env() -> int:
+    """Read TOOL_CONCURRENCY_LIMIT, ignoring non-integers and clamping it to at least 1.
+
+    Defaults are built before validation, and a limit below 1 would make the
+    tool semaphore hang or fail, so a bad value must not get through.
+    """
+    try:
+        limit = int(os.getenv("TOOL_CONCURRENCY_LIMIT", _DEFAULT_TOOL_CONCURRENCY_LIMIT))
+    except ValueError:
+        return _DEFAULT_TOOL_CONCURRENCY_LIMIT
+    return max(limit, 1)
 
 
 class Configuration(BaseModel):
     """Configuration for the agent."""
 
+    # Runtime configurables carry other keys too; drop them during validation
+    model_config = ConfigDict(extra="ignore")
+
     model_name: str = Field(
         default="gemini-2.5-flash",
         description="LLM model to use"
@@ -21,6 +41,12 @@ class Configuration(BaseModel):
     max_tool_calls: int = Field(
         default=5, description="Maximum consecutive tool calls before stopping"
     )
+    tool_concurrency_limit: int = Field(
+        default_factory=_tool_concurrency_limit_from_env,
+        ge=1,
+        validate_default=True,
+        description="Maximum number of tool calls executed concurrently"
+    )
     system_message: str = Field(
         default="""You are a helpful assistant that can search the web and academic papers to answer questions. 
                 You can use tools like Brave Search and ArXiv Search to find information. 
@@ -1,21 +1,32 @@
 """This module defines the state graph for the agent, including the main agent node and tool handling."""
 
+from functools import lru_cache
 from typing import Sequence
 
-from langchain_core.messages import AnyMessage, BaseMessage, SystemMessage, ToolMessage
-from langchain_core.runnables import RunnableConfig
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import (
+    AnyMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.runnables import Runnable, RunnableConfig
 from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.types import StreamWriter
+from langgraph.utils.runnable import RunnableCallable
 
 from agent.config import Configuration
-from agent.tools import tools
+from agent.tools import get_tools, get_tools_map
 from agent.utils import (
+    aprocess_tool_calls,
     filter_empty_content_messages,
     get_agent_config,
     get_llm,
     get_system_message,
     has_too_many_consecutive_tool_calls,
+    iter_tool_calls,
     message_has_tool_calls,
-    process_tool_calls,
 )
 
 
@@ -24,29 +35,38 @@ class AgentState(MessagesState):
     pass
 
 
+@lru_cache(maxsize=8)
+def _get_bound_llm(model_name: str, temperature: float) -> Runnable[LanguageModelInput, BaseMessage]:
+    """Get the LLM with tools bound, reused across graph steps with the same settings."""
+    llm = get_llm(Configuration(model_name=model_name, temperature=temperature))
+    return llm.bind_tools(get_tools())
+
+
 def agent_node(state: AgentState, config: RunnableConfig) -> dict[str, Sequence[BaseMessage]]:
     """Process user messages and generate a response."""
     agent_config: Configuration = get_agent_config(config)
 
     # Get LLM and system message based on configuration
-    llm = get_llm(agent_config)
-    llm_with_tools = llm.bind_tools(tools)
+    llm_with_tools = _get_bound_llm(agent_config.model_name, agent_config.temperature)
     system_message = get_system_message(agent_config)
 
     messages = state["messages"]
 
+    # Build the prompt in one list instead of concatenating and then filtering;
+    # the state's own message list is left untouched
+    processed_messages: list[AnyMessage] = []
+
     # Add system message if it's not already the first message
     if not messages or not isinstance(messages[0], SystemMessage):
-        messages = [system_message] + messages
+        processed_messages.append(system_message)
+
+    # Filter messages to ensure no empty content (prevents Gemini errors)
+    processed_messages.extend(filter_empty_content_messages(messages))
 
     # Handle empty conversation case - Gemini requires at least one user message
-    if len(messages) == 1 and isinstance(messages[0], SystemMessage):
+    if len(processed_messages) == 1 and isinstance(processed_messages[0], SystemMessage):
         # Add a minimal user message to satisfy Gemini's requirements
-        from langchain_core.messages import HumanMessage
-        messages.append(HumanMessage(content="Hello"))
-
-    # Filter messages to ensure no empty content (prevents Gemini errors)
-    processed_messages = filter_empty_content_messages(messages)
+        processed_messages.append(HumanMessage(content="Hello"))
 
     response = llm_with_tools.invoke(processed_messages)
     return {"messages": [response]}
@@ -70,17 +90,56 @@ def should_continue(state: AgentState, config: RunnableConfig) -> str:
     return END
 
 
-def tools_node(state: AgentState, config: RunnableConfig) -> dict[str, Sequence[BaseMessage]]:
-    """Handle tool execution using the modern tool calling format."""
+def tools_node(
+    state: AgentState,
+    config: RunnableConfig,
+    writer: StreamWriter
+) -> dict[str, Sequence[BaseMessage]]:
+    """Handle tool execution using the modern tool calling format.
+
+    Used by graph.invoke; tool calls run one after another. Each result is also
+    sent to the "custom" stream as soon as its tool finishes.
+    """
     last_message: AnyMessage = state["messages"][-1]
 
     # Handle tool_calls format
     tool_calls = getattr(last_message, "tool_calls", None)
     if tool_calls:
-        messages_to_add = process_tool_calls(tool_calls, tools)
+        messages_to_add = []
+        for message in iter_tool_calls(tool_calls, get_tools_map()):
+            writer({"tool_message": message})
+            messages_to_add.append(message)
         return {"messages": messages_to_add}
 
-    # log a warning for observation
+    # No tool calls found - this shouldn't happen with modern LLMs
+    return {"messages": [ToolMessage(content="No tool calls found", tool_call_id="error")]}
+
+
+async def atools_node(
+    state: AgentState,
+    config: RunnableConfig,
+    writer: StreamWriter
+) -> dict[str, Sequence[BaseMessage]]:
+    """Handle tool execution using the modern tool calling format.
+
+    Used by graph.ainvoke and graph.astream. All tool calls from the last
+    message are dispatched concurrently, so a turn that searches both Brave and
+    arXiv waits for the slowest call only. Each result is also sent to the
+    "custom" stream as soon as its tool finishes.
+    """
+    agent_config: Configuration = get_agent_config(config)
+    last_message: AnyMessage = state["messages"][-1]
+
+    # Handle tool_calls format
+    tool_calls = getattr(last_message, "tool_calls", None)
+    if tool_calls:
+        messages_to_add = await aprocess_tool_calls(
+            tool_calls,
+            get_tools_map(),
+            max_concurrency=agent_config.tool_concurrency_limit,
+            on_result=lambda message: writer({"tool_message": message})
+        )
+        return {"messages": messages_to_add}
 
     # No tool calls found - this shouldn't happen with modern LLMs
     return {"messages": [ToolMessage(content="No tool calls found", tool_call_id="error")]}
@@ -89,7 +148,14 @@ def tools_node(state: AgentState, config: RunnableConfig) -> dict[str, Sequence[
 workflow = StateGraph(AgentState, config_schema=Configuration)
 
 workflow.add_node("agent_node", agent_node)
-workflow.add_node("tools_node", tools_node)
+# Sync and async implementations, so both graph.invoke and graph.ainvoke work.
+# trace=False matches how add_node wraps plain functions, so the node is not
+# traced twice. RunnableCallable lives in an internal langgraph module, which
+# the langgraph==0.5.4 pin keeps importable.
+workflow.add_node(
+    "tools_node",
+    RunnableCallable(tools_node, atools_node, name="tools_node", trace=False)
+)
 
 workflow.add_edge(START, "agent_node")
 workflow.add_edge("tools_node", "agent_node")
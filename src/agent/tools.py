@@ -1,11 +1,38 @@
-"""This module define all tools available for the agent."""
+"""This module define all tools available for the agent.
+
+The tools are built on first use rather than at import time, so importing the
+graph (tests, CLI help, worker start-up) does not pay for client set-up.
+"""
 
 import os
+from functools import cache
+from typing import Any
+
+from langchain_core.tools import BaseTool
 
 from .arxiv_search_tool import ArxivSearchTool
 from .brave_search_tool import BraveSearchTool
 
-tools = [
-    BraveSearchTool(api_key=os.getenv("BRAVE_SEARCH_API_KEY")),
-    ArxivSearchTool(max_results=5),
-]
+
+@cache
+def get_tools() -> list[BaseTool]:
+    """Get the tools available for the agent, building them on first call."""
+    return [
+        BraveSearchTool(api_key=os.getenv("BRAVE_SEARCH_API_KEY")),
+        ArxivSearchTool(max_results=5),
+    ]
+
+
+@cache
+def get_tools_map() -> dict[str, BaseTool]:
+    """Get the agent tools keyed by name, for O(1) dispatch of tool calls."""
+    return {t.name: t for t in get_tools()}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``tools`` and ``tools_map`` lazily on first attribute access (PEP 562)."""
+    if name == "tools":
+        return get_tools()
+    if name == "tools_map":
+        return get_tools_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,33 +1,64 @@
 """Utility functions for the agent graph."""
 
-from copy import copy
-from typing import Any, Dict, List, Sequence
-
-from langchain_core.messages import AnyMessage, SystemMessage, ToolMessage
+import asyncio
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+)
+
+from langchain_core.messages import (
+    AnyMessage,
+    FunctionMessage,
+    SystemMessage,
+    ToolMessage,
+)
 from langchain_core.runnables import RunnableConfig
 from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import ValidationError
 
 from agent.config import Configuration
 
+# Shared fallback for invalid runtime configuration; treat it as read-only
+_DEFAULT_CONFIG = Configuration()
+
+# Message types carrying a tool result, including legacy function-call results
+_TOOL_RESPONSE_TYPES = (ToolMessage, FunctionMessage)
+
 
 def has_too_many_consecutive_tool_calls(
     messages: Sequence[AnyMessage],
     max_calls: int = 3,
     look_back: int = 10
 ) -> bool:
-    """Check if there are too many consecutive tool calls to prevent infinite loops."""
-    recent_messages = messages[-look_back:] if len(
-        messages) > look_back else messages
+    """Check if there are too many consecutive tool calls to prevent infinite loops.
+
+    Only the trailing run of messages matters, so the history is walked
+    backwards from the end and the scan stops as soon as the answer is known.
+    """
     consecutive_tool_calls = 0
+    last = len(messages) - 1
 
-    for msg in reversed(recent_messages):
-        if message_has_tool_calls(msg):
+    for i in range(last, max(-1, last - look_back), -1):
+        msg = messages[i]
+        # Same checks as message_has_tool_calls and is_tool_response, inlined
+        # since this runs on every graph step
+        if getattr(msg, "tool_calls", None):
             consecutive_tool_calls += 1
-        elif is_tool_response(msg):
+            if consecutive_tool_calls >= max_calls:
+                return True
+        elif isinstance(msg, _TOOL_RESPONSE_TYPES):
             continue  # Skip tool responses, they don't break the chain
         else:
             break  # Stop at first non-tool message
 
+    # Only reached below the limit, unless max_calls is zero or negative
     return consecutive_tool_calls >= max_calls
 
 
@@ -40,88 +71,211 @@ def message_has_tool_calls(message: AnyMessage) -> bool:
 
 def is_tool_response(message: AnyMessage) -> bool:
     """Check if a message is a tool response."""
-    return isinstance(message, ToolMessage)
+    return isinstance(message, _TOOL_RESPONSE_TYPES)
+
+
+def format_tool_result(result: Any) -> str:
+    """Convert a raw tool result into non-empty message content."""
+    # Ensure result is not empty or None
+    if result is None:
+        return "Tool execution completed with no output"
+    # Search tools already return str, so only convert other result types
+    result_content = (result if isinstance(result, str) else str(result)).strip()
+    return result_content or "Tool execution completed but returned empty result"
 
 
 def execute_tool(tool: Any, tool_name: str, tool_input: Dict[str, Any]) -> str:
     """Execute a single tool and return the result content."""
+    # Only the tool itself is guarded; formatting its result does not raise
     try:
         result = tool.run(tool_input)
-        # Ensure result is not empty or None
-        result_content = str(
-            result) if result is not None else "Tool execution completed with no output"
-        result_content = result_content.strip()
-        if not result_content:
-            result_content = "Tool execution completed but returned empty result"
-        return result_content
     except Exception as e:
         return f"Error executing tool {tool_name}: {str(e)}"
+    return format_tool_result(result)
 
 
-def find_tool_by_name(tools: List[Any], tool_name: str) -> Any:
-    """Find a tool by its name from the tools list."""
-    return next((t for t in tools if t.name == tool_name), None)
+async def aexecute_tool(tool: Any, tool_name: str, tool_input: Dict[str, Any]) -> str:
+    """Asynchronously execute a single tool and return the result content."""
+    try:
+        if hasattr(tool, "ainvoke"):
+            result = await tool.ainvoke(tool_input)
+        else:
+            # Run tools without async support in a worker thread instead
+            result = await asyncio.to_thread(tool.run, tool_input)
+    except Exception as e:
+        return f"Error executing tool {tool_name}: {str(e)}"
+    return format_tool_result(result)
 
 
-def process_tool_calls(tool_calls: List[Dict[str, Any]], tools: List[Any]) -> List[ToolMessage]:
-    """Process tool calls and return ToolMessage list."""
-    messages_to_add = []
+def iter_tool_calls(tool_calls: List[Dict[str, Any]], tools_map: Mapping[str, Any]) -> Iterator[ToolMessage]:
+    """Execute tool calls in order, yielding each ToolMessage as soon as it is ready.
 
+    Args:
+        tool_calls: Tool calls from the last AI message
+        tools_map: Available tools keyed by name
+    """
     for tool_call in tool_calls:
         tool_name = tool_call["name"]
         tool_input = tool_call["args"]
 
-        tool = find_tool_by_name(tools, tool_name)
+        tool = tools_map.get(tool_name)
         if tool:
             result_content = execute_tool(tool, tool_name, tool_input)
         else:
             result_content = f"Tool '{tool_name}' not found"
 
-        messages_to_add.append(
-            ToolMessage(content=result_content, tool_call_id=tool_call["id"])
-        )
+        yield ToolMessage(content=result_content, tool_call_id=tool_call["id"])
 
-    return messages_to_add
+
+def process_tool_calls(tool_calls: List[Dict[str, Any]], tools_map: Mapping[str, Any]) -> List[ToolMessage]:
+    """Process tool calls and return ToolMessage list.
+
+    Args:
+        tool_calls: Tool calls from the last AI message
+        tools_map: Available tools keyed by name
+    """
+    return list(iter_tool_calls(tool_calls, tools_map))
+
+
+async def aiter_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    tools_map: Mapping[str, Any],
+    max_concurrency: int = 4
+) -> AsyncIterator[tuple[int, ToolMessage]]:
+    """Execute tool calls concurrently, yielding (call index, ToolMessage) in completion order.
+
+    Tool calls are network-bound, so running them together makes a turn take
+    as long as its slowest call rather than the sum of all of them. The index
+    is the position of the call in tool_calls, which pairs results with calls
+    even when tool call ids repeat.
+
+    Args:
+        tool_calls: Tool calls from the last AI message
+        tools_map: Available tools keyed by name
+        max_concurrency: Maximum number of tools running at the same time,
+            to avoid hammering rate-limited APIs
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_tool_call(i: int, tool_call: Dict[str, Any]) -> tuple[int, ToolMessage]:
+        tool_name = tool_call["name"]
+        tool = tools_map.get(tool_name)
+        if tool:
+            async with semaphore:
+                result_content = await aexecute_tool(tool, tool_name, tool_call["args"])
+        else:
+            result_content = f"Tool '{tool_name}' not found"
+        return i, ToolMessage(content=result_content, tool_call_id=tool_call["id"])
+
+    tasks = [
+        asyncio.ensure_future(run_tool_call(i, tool_call))
+        for i, tool_call in enumerate(tool_calls)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Don't leave tools running if the consumer stops early
+        for task in tasks:
+            task.cancel()
+
+
+async def aprocess_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    tools_map: Mapping[str, Any],
+    max_concurrency: int = 4,
+    on_result: Callable[[ToolMessage], None] | None = None
+) -> List[ToolMessage]:
+    """Process tool calls concurrently and return ToolMessage list in call order.
+
+    Args:
+        tool_calls: Tool calls from the last AI message
+        tools_map: Available tools keyed by name
+        max_concurrency: Maximum number of tools running at the same time
+        on_result: Optional callback receiving each ToolMessage as soon as its
+            tool finishes, before the slower ones are done
+    """
+    # Results are placed by call index, restoring the call order the LLM
+    # expects to see (ids alone can repeat)
+    messages_to_add: List[ToolMessage | None] = [None] * len(tool_calls)
+    async for i, message in aiter_tool_calls(tool_calls, tools_map, max_concurrency):
+        if on_result is not None:
+            on_result(message)
+        messages_to_add[i] = message
+    return [message for message in messages_to_add if message is not None]
+
+
+def is_empty_content(content: Any) -> bool:
+    """Check if message content is empty or only whitespace."""
+    # isspace() scans in place, unlike strip() which allocates a new string
+    return not content or (isinstance(content, str) and content.isspace())
 
 
 def filter_empty_content_messages(messages: List[AnyMessage]) -> List[AnyMessage]:
-    """Filter messages to ensure no message has empty content (prevents Gemini errors)."""
+    """Filter messages to ensure no message has empty content (prevents Gemini errors).
+
+    Returns the input list itself when no message needs rewriting.
+    """
+    # Fast path: most turns have nothing to fix, so avoid building a new list
+    if not any(is_empty_content(getattr(m, "content", "")) for m in messages):
+        return messages
+
     processed_messages: List[AnyMessage] = []
     for message in messages:
         content = getattr(message, "content", "")
 
         # If content is empty or just whitespace, provide minimal content
-        if not content or (isinstance(content, str) and not content.strip()):
+        if is_empty_content(content):
             # Create a copy with minimal non-empty content
-            new_message = copy(message)
             if isinstance(message, ToolMessage):
-                new_message.content = "Completed"
+                processed_messages.append(
+                    message.model_copy(update={"content": "Completed"}))
             elif isinstance(message, SystemMessage):
                 # Keep system message as is (it should have content)
                 processed_messages.append(message)
-                continue
             else:
-                new_message.content = "..."
-            processed_messages.append(new_message)
+                processed_messages.append(
+                    message.model_copy(update={"content": "..."}))
         else:
             processed_messages.append(message)
 
     return processed_messages
 
 
+@lru_cache(maxsize=4)
+def _build_system_message(content: str) -> SystemMessage:
+    """Build a system message, shared by every caller using the same content."""
+    return SystemMessage(content=content)
+
+
 def get_system_message(config: Configuration) -> SystemMessage:
-    """Get the system message based on configuration."""
-    return SystemMessage(content=config.system_message)
+    """Get the system message based on configuration.
 
+    The message is cached by its content and shared, so callers must not
+    mutate it.
+    """
+    return _build_system_message(config.system_message)
 
-def get_llm(config: Configuration) -> ChatGoogleGenerativeAI:
-    """Get the LLM based on configuration."""
+
+@lru_cache(maxsize=8)
+def _build_llm(model_name: str, temperature: float) -> ChatGoogleGenerativeAI:
+    """Build an LLM client, shared by every caller using the same settings."""
     return ChatGoogleGenerativeAI(
-        model=config.model_name,
-        temperature=config.temperature
+        model=model_name,
+        temperature=temperature
     )
 
 
+def get_llm(config: Configuration) -> ChatGoogleGenerativeAI:
+    """Get the LLM based on configuration.
+
+    Clients are cached by model name and temperature, so repeated calls reuse
+    the same client and its connection pool. Mutating a Configuration after
+    the first call does not affect an already cached client.
+    """
+    return _build_llm(config.model_name, config.temperature)
+
+
 def get_agent_config(config: RunnableConfig) -> Configuration:
     """Extract and validate agent configuration from RunnableConfig.
 
@@ -134,17 +288,12 @@ def get_agent_config(config: RunnableConfig) -> Configuration:
     Returns:
         Configuration: A validated Configuration instance
     """
-    configurable = config.get("configurable", {})
-
-    # Filter out non-Configuration fields to avoid Pydantic validation errors
-    config_fields = Configuration.model_fields.keys()
-    filtered_config = {
-        key: value for key, value in configurable.items()
-        if key in config_fields
-    }
+    configurable = config.get("configurable") or {}
 
+    # Configuration ignores unknown keys (e.g. LangGraph's own thread_id), so
+    # the runtime dict can be validated as is
     try:
-        return Configuration(**filtered_config)
-    except (TypeError, ValueError, KeyError):
+        return Configuration.model_validate(configurable)
+    except ValidationError:
         # Log the error in production for debugging
-        return Configuration()
+        return _DEFAULT_CONFIG
@@ -1,11 +1,14 @@
 """Integration tests for the agent graph."""
 
+from datetime import datetime
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 from langchain_core.messages import HumanMessage
 
 from agent import graph
+from agent.brave_search_tool import BraveSearchTool
 from agent.graph import AgentState
 
 pytestmark = pytest.mark.anyio
@@ -35,17 +38,24 @@ async def test_agent_responds_to_greeting() -> None:
 
 
 @pytest.mark.langsmith
-@patch('agent.brave_search_tool.BraveSearch.from_api_key')
-async def test_agent_with_search_tool_request(mock_brave_search) -> None:
+async def test_agent_with_search_tool_request() -> None:
     """Test agent can handle requests that might use search tools."""
-    # Mock the Brave Search tool
-    mock_search_instance = Mock()
-    mock_search_instance.run.return_value = "Weather information for today"
-    mock_brave_search.return_value = mock_search_instance
+    # Mock the Brave Search API at the HTTP transport
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"web": {"results": [{
+            "title": "Today's weather",
+            "url": "https://example.com/weather",
+            "description": "Weather information for today",
+        }]}})
 
     inputs: AgentState = {"messages": [HumanMessage(
         content="What's the weather like today?")]}
-    res = await graph.ainvoke(inputs)
+    with patch.object(
+        BraveSearchTool,
+        "_new_async_client",
+        side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    ):
+        res = await graph.ainvoke(inputs)
 
     assert res is not None
     assert "messages" in res
@@ -62,8 +72,7 @@ async def test_agent_with_arxiv_search_request(mock_arxiv_client) -> None:
     mock_paper.title = "Test Machine Learning Paper"
     mock_paper.authors = [Mock(name="John Doe")]
     mock_paper.summary = "This is a test paper about machine learning."
-    mock_paper.published = Mock()
-    mock_paper.published.strftime.return_value = "2023-01-15"
+    mock_paper.published = datetime(2023, 1, 15)
     mock_paper.entry_id = "http://arxiv.org/abs/2301.12345v1"
     mock_paper.categories = ["cs.AI"]
 
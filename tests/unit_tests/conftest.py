@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, Iterator
+
+import pytest
+from langchain_core.tools import BaseTool, tool
+
+from agent import arxiv_search_tool, brave_search_tool
+
+
+@pytest.fixture(autouse=True)
+def clear_search_caches() -> Iterator[None]:
+    """Keep cached search results from leaking between tests."""
+    caches = (arxiv_search_tool._search_cache, brave_search_tool._search_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture
+def sleepy() -> BaseTool:
+    """Async tool that echoes its text after a delay, for completion-order tests."""
+
+    @tool
+    async def sleepy(text: str, delay: float) -> str:
+        """Echo the given text after a delay."""
+        await asyncio.sleep(delay)
+        return text
+
+    return sleepy
+
+
+@pytest.fixture
+def slow_then_fast_calls() -> list[dict[str, Any]]:
+    """Two sleepy tool calls where the first one finishes last."""
+    return [
+        {"name": "sleepy", "args": {"text": "slow", "delay": 0.05}, "id": "call_1"},
+        {"name": "sleepy", "args": {"text": "fast", "delay": 0.0}, "id": "call_2"},
+    ]
@@ -0,0 +1,75 @@
+"""Unit tests for the arXiv search tool output."""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from agent.arxiv_search_tool import ArxivSearchTool
+
+
+def make_paper(title: str, authors: list[str], summary: str = "A summary.") -> Mock:
+    paper = Mock()
+    paper.title = title
+    paper.authors = []
+    for name in authors:
+        author = Mock()
+        author.name = name
+        paper.authors.append(author)
+    paper.summary = summary
+    paper.published = datetime(2023, 1, 15, 12, 30, tzinfo=timezone.utc)
+    paper.entry_id = "http://arxiv.org/abs/2301.12345v1"
+    paper.categories = ["cs.AI", "cs.LG"]
+    return paper
+
+
+@patch("agent.arxiv_search_tool.arxiv.Client")
+def test_arxiv_search_formats_results(mock_client_class) -> None:
+    """Test that results are numbered from the start offset and formatted per paper.
+
+    Line wrapping inside titles and summaries is collapsed to single spaces.
+    """
+    mock_client_class.return_value.results.return_value = [
+        make_paper("First Paper", ["Ann", "Bob", "Cy", "Dee"], summary="x" * 400),
+        make_paper("Second\n  Paper", ["Eve"], summary="A\n  summary.\n"),
+        make_paper("Third Paper", ["Fay"]),
+    ]
+
+    result = ArxivSearchTool()._run("agents", max_results=2, start=10)
+
+    assert result == (
+        "Found 2 papers for query: 'agents' (showing results 11-12)\n\n"
+        "11. **First Paper**\n"
+        "   Authors: Ann, Bob, Cy et al.\n"
+        "   Published: 2023-01-15\n"
+        "   Categories: cs.AI, cs.LG\n"
+        "   URL: http://arxiv.org/abs/2301.12345v1\n"
+        f"   Summary: {'x' * 300}...\n\n"
+        "12. **Second Paper**\n"
+        "   Authors: Eve\n"
+        "   Published: 2023-01-15\n"
+        "   Categories: cs.AI, cs.LG\n"
+        "   URL: http://arxiv.org/abs/2301.12345v1\n"
+        "   Summary: A summary....\n\n"
+    )
+
+
+@patch("agent.arxiv_search_tool.arxiv.Client")
+def test_arxiv_search_fetches_a_single_page(mock_client_class) -> None:
+    """Test that the client is sized to fetch the requested window in one page."""
+    mock_client_class.return_value.results.return_value = []
+
+    ArxivSearchTool()._run("agents", max_results=5, start=20)
+
+    assert mock_client_class.call_args.kwargs["page_size"] == 5
+    search = mock_client_class.return_value.results.call_args.args[0]
+    assert search.max_results == 25
+    assert mock_client_class.return_value.results.call_args.kwargs["offset"] == 20
+
+
+@patch("agent.arxiv_search_tool.arxiv.Client")
+def test_arxiv_search_without_results(mock_client_class) -> None:
+    """Test the message returned when nothing matches."""
+    mock_client_class.return_value.results.return_value = []
+
+    result = ArxivSearchTool()._run("nothing matches this")
+
+    assert result == "No papers found for query: nothing matches this"
@@ -0,0 +1,76 @@
+"""Unit tests for the Brave Search tool."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from agent.brave_search_tool import BRAVE_SEARCH_URL, BraveSearchTool
+
+
+@pytest.mark.anyio
+async def test_brave_search_async_uses_pooled_client() -> None:
+    """Test that async searches call the Brave API and format the results."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"web": {"results": [{
+            "title": "LangGraph",
+            "url": "https://example.com",
+            "description": "Build agents.",
+            "extra_snippets": ["With graphs."],
+        }]}})
+
+    tool = BraveSearchTool(api_key="test-key")
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch.object(BraveSearchTool, "_new_async_client", return_value=client):
+        result = await tool.ainvoke({"query": "langgraph"})
+        # Repeated queries are served from the cache
+        await tool.ainvoke({"query": "langgraph"})
+    await tool.aclose()
+
+    assert json.loads(result) == [{
+        "title": "LangGraph",
+        "link": "https://example.com",
+        "snippet": "Build agents. With graphs.",
+    }]
+    assert len(requests) == 1
+    assert str(requests[0].url).startswith(BRAVE_SEARCH_URL)
+    assert requests[0].url.params["q"] == "langgraph"
+    assert requests[0].headers["X-Subscription-Token"] == "test-key"
+    assert client.is_closed
+
+
+@pytest.mark.anyio
+async def test_brave_search_async_requires_api_key() -> None:
+    """Test that async searches fail clearly without an API key."""
+    with pytest.raises(ValueError, match="API key"):
+        await BraveSearchTool()._arun("langgraph")
+
+
+def test_brave_search_async_client_per_event_loop() -> None:
+    """Test that each event loop gets its own client, closed when the loop shuts down."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"web": {"results": []}})
+
+    clients: list[httpx.AsyncClient] = []
+
+    def new_client() -> httpx.AsyncClient:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+
+    tool = BraveSearchTool(api_key="test-key")
+    with patch.object(BraveSearchTool, "_new_async_client", side_effect=new_client):
+        for query in ("first", "second"):
+            assert asyncio.run(tool.ainvoke({"query": query})) == "[]"
+
+    # Pooled connections never cross loops, and asyncio.run closed each client
+    assert len(clients) == 2
+    assert all(client.is_closed for client in clients)
+    assert not tool._async_clients
@@ -0,0 +1,56 @@
+"""Unit tests for the tool result cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from agent.cache import TTLCache
+
+
+def test_cache_returns_stored_value() -> None:
+    """Test that a stored value is returned until it is evicted."""
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+
+    # "b" is now the least recently used entry and is evicted first
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_cache_entries_expire() -> None:
+    """Test that entries are dropped once their time-to-live has passed."""
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=10)
+    with patch("agent.cache.time.monotonic", return_value=100.0):
+        cache.set("a", "1")
+    with patch("agent.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == "1"
+    with patch("agent.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+
+
+@pytest.mark.anyio
+async def test_single_flight_coalesces_identical_lookups() -> None:
+    """Test that concurrent lookups for the same key do the work only once."""
+    cache: TTLCache[str] = TTLCache()
+    calls = 0
+
+    async def lookup() -> str:
+        nonlocal calls
+        async with cache.single_flight("q"):
+            cached = cache.get("q")
+            if cached is not None:
+                return cached
+            calls += 1
+            await asyncio.sleep(0.01)
+            cache.set("q", "result")
+            return "result"
+
+    results = await asyncio.gather(*(lookup() for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert calls == 1
@@ -4,6 +4,7 @@ import os
 import sys
 from unittest.mock import Mock, patch
 
+import pytest
 from langchain_core.messages import SystemMessage
 from langchain_core.tools import BaseTool
 from langgraph.pregel import Pregel
@@ -17,7 +18,7 @@ with patch('langchain_google_genai.ChatGoogleGenerativeAI') as mock_llm:
     from agent.config import Configuration
     from agent.graph import graph
     from agent.tools import tools
-    from agent.utils import get_agent_config, get_llm, get_system_message
+    from agent.utils import _build_llm, get_agent_config, get_llm, get_system_message
 
 
 def test_graph_is_pregel_instance() -> None:
@@ -44,6 +45,7 @@ def test_llm_configuration() -> None:
     """Test that the LLM is properly configured."""
     config = Configuration()
 
+    _build_llm.cache_clear()
     with patch('agent.utils.ChatGoogleGenerativeAI') as mock_llm_class:
         mock_llm_instance = Mock()
         mock_llm_class.return_value = mock_llm_instance
@@ -57,6 +59,11 @@ def test_llm_configuration() -> None:
         )
         assert llm == mock_llm_instance
 
+        # The same settings reuse the cached client
+        assert get_llm(Configuration()) is llm
+        mock_llm_class.assert_called_once()
+    _build_llm.cache_clear()
+
 
 def test_configuration_defaults() -> None:
     """Test that Configuration has the expected default values."""
@@ -65,9 +72,22 @@ def test_configuration_defaults() -> None:
     assert config.model_name == "gemini-2.5-flash"
     assert config.temperature == 0.0
     assert config.max_tool_calls == 5
+    assert config.tool_concurrency_limit == 4
     assert len(config.system_message) > 0
 
 
+@pytest.mark.parametrize(("env_value", "expected"), [
+    ("8", 8), ("0", 1), ("-3", 1), ("abc", 4),
+])
+def test_tool_concurrency_limit_from_env(
+    monkeypatch: pytest.MonkeyPatch, env_value: str, expected: int
+) -> None:
+    """Test that the env default is parsed and clamped instead of breaking the semaphore."""
+    monkeypatch.setenv("TOOL_CONCURRENCY_LIMIT", env_value)
+
+    assert Configuration().tool_concurrency_limit == expected
+
+
 def test_tools_are_base_tool_instances() -> None:
     """Test that all tools are proper BaseTool instances."""
     # The tools should be available in the tools list
@@ -0,0 +1,134 @@
+"""Unit tests for the agent graph nodes, with the LLM stubbed out."""
+
+import sys
+from typing import Any, Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import BaseTool, tool
+
+from agent import graph
+from agent.graph import AgentState, agent_node, atools_node
+
+# agent/__init__ re-exports the compiled graph under the submodule's name
+graph_module = sys.modules["agent.graph"]
+
+
+@tool
+def echo(text: str) -> str:
+    """Echo the given text."""
+    return text
+
+
+def tool_turn_llm() -> Mock:
+    """Stub LLM that calls echo twice, then answers once it has the results."""
+    llm = Mock()
+    llm.invoke.side_effect = [
+        AIMessage(content="", tool_calls=[
+            {"name": "echo", "args": {"text": "first"}, "id": "call_1"},
+            {"name": "echo", "args": {"text": "second"}, "id": "call_2"},
+        ]),
+        AIMessage(content="Done"),
+    ]
+    return llm
+
+
+@pytest.fixture
+def llm() -> Iterator[Mock]:
+    llm = tool_turn_llm()
+    with patch.object(graph_module, "_get_bound_llm", return_value=llm), \
+            patch.object(graph_module, "get_tools_map", return_value={"echo": echo}):
+        yield llm
+
+
+def assert_tool_turn(res: dict[str, Any]) -> None:
+    messages = res["messages"]
+    assert [type(m) for m in messages] == [
+        HumanMessage, AIMessage, ToolMessage, ToolMessage, AIMessage
+    ]
+    assert [m.content for m in messages[2:4]] == ["first", "second"]
+    assert messages[-1].content == "Done"
+
+
+def test_graph_invoke_runs_tools_synchronously(llm: Mock) -> None:
+    """Test that graph.invoke works through a tool turn, not only graph.ainvoke."""
+    res = graph.invoke({"messages": [HumanMessage(content="Echo twice")]})
+
+    assert_tool_turn(res)
+
+
+def test_graph_stream_sends_tool_results_synchronously(llm: Mock) -> None:
+    """Test that the sync tools node also streams each result as it finishes."""
+    chunks = list(graph.stream(
+        {"messages": [HumanMessage(content="Echo twice")]}, stream_mode="custom"
+    ))
+
+    assert [chunk["tool_message"].content for chunk in chunks] == ["first", "second"]
+
+
+def test_graph_traces_tools_node_once(llm: Mock) -> None:
+    """Test that the tools node is traced like the other nodes, not nested twice."""
+    started: list[str | None] = []
+
+    class RecordChainStarts(BaseCallbackHandler):
+        def on_chain_start(self, serialized: Any, inputs: Any, **kwargs: Any) -> None:
+            started.append(kwargs.get("name"))
+
+    graph.invoke(
+        {"messages": [HumanMessage(content="Echo twice")]},
+        {"callbacks": [RecordChainStarts()]},
+    )
+
+    assert started.count("tools_node") == 1
+    assert started.count("agent_node") == 2
+
+
+@pytest.mark.anyio
+async def test_graph_ainvoke_runs_tools(llm: Mock) -> None:
+    """Test that graph.ainvoke gives the same result through the async tools node."""
+    res = await graph.ainvoke({"messages": [HumanMessage(content="Echo twice")]})
+
+    assert_tool_turn(res)
+
+
+@pytest.mark.parametrize("messages", [
+    [],
+    [SystemMessage(content="Be brief.")],
+    [HumanMessage(content="Hi"), AIMessage(content="")],
+])
+def test_agent_node_leaves_state_messages_unchanged(messages: list[Any]) -> None:
+    """Test that the prompt is built on the side, without appending to the state."""
+    llm = Mock()
+    llm.invoke.return_value = AIMessage(content="Hi there")
+    state: AgentState = {"messages": messages}
+    before = [(type(m), m.content) for m in messages]
+
+    with patch.object(graph_module, "_get_bound_llm", return_value=llm):
+        res = agent_node(state, {})
+
+    assert state["messages"] is messages
+    assert [(type(m), m.content) for m in messages] == before
+    assert res == {"messages": [llm.invoke.return_value]}
+    prompt = llm.invoke.call_args.args[0]
+    assert isinstance(prompt[0], SystemMessage)
+    if len(messages) <= 1:
+        # Gemini needs a user message, which is only added to the prompt
+        assert [type(m) for m in prompt] == [SystemMessage, HumanMessage]
+
+
+@pytest.mark.anyio
+async def test_atools_node_streams_results_and_keeps_call_order(
+    sleepy: BaseTool, slow_then_fast_calls: list[dict[str, Any]]
+) -> None:
+    """Test that results stream as tools finish, while the state update keeps call order."""
+    state: AgentState = {"messages": [AIMessage(content="", tool_calls=slow_then_fast_calls)]}
+    streamed: list[Any] = []
+
+    with patch.object(graph_module, "get_tools_map", return_value={"sleepy": sleepy}):
+        res = await atools_node(state, {}, streamed.append)
+
+    assert [m.tool_call_id for m in res["messages"]] == ["call_1", "call_2"]
+    assert [m.content for m in res["messages"]] == ["slow", "fast"]
+    assert [chunk["tool_message"].content for chunk in streamed] == ["fast", "slow"]
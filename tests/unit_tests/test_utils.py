@@ -0,0 +1,158 @@
+"""Unit tests for the agent graph utilities."""
+
+import asyncio
+from collections import deque
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import BaseTool, tool
+
+from agent.utils import (
+    aiter_tool_calls,
+    aprocess_tool_calls,
+    filter_empty_content_messages,
+    has_too_many_consecutive_tool_calls,
+    process_tool_calls,
+)
+
+
+@tool
+def echo(text: str) -> str:
+    """Echo the given text."""
+    return text
+
+
+def tool_call_turn(call_id: str) -> list[AIMessage | ToolMessage]:
+    return [
+        AIMessage(content="", tool_calls=[{"name": "echo", "args": {}, "id": call_id}]),
+        ToolMessage(content="result", tool_call_id=call_id),
+    ]
+
+
+def test_consecutive_tool_calls_counts_trailing_run() -> None:
+    """Test that only tool calls after the last regular message are counted."""
+    messages = [
+        HumanMessage(content="Hi"),
+        *tool_call_turn("1"),
+        *tool_call_turn("2"),
+        AIMessage(content="Done"),
+        HumanMessage(content="Again"),
+        *tool_call_turn("3"),
+        *tool_call_turn("4"),
+    ]
+
+    assert not has_too_many_consecutive_tool_calls(messages, max_calls=3)
+    messages.extend(tool_call_turn("5"))
+    assert has_too_many_consecutive_tool_calls(messages, max_calls=3)
+
+
+def test_consecutive_tool_calls_respects_look_back() -> None:
+    """Test that calls outside the look-back window are ignored."""
+    messages = [msg for i in range(5) for msg in tool_call_turn(str(i))]
+
+    assert has_too_many_consecutive_tool_calls(messages, max_calls=5, look_back=10)
+    assert not has_too_many_consecutive_tool_calls(messages, max_calls=5, look_back=8)
+
+    # Any indexable sequence works, such as a rolling deque of recent messages
+    recent = deque(messages, maxlen=10)
+    assert has_too_many_consecutive_tool_calls(recent, max_calls=5)
+
+
+def test_consecutive_tool_calls_with_non_positive_limit() -> None:
+    """Test that a zero limit is always reached, even without tool calls."""
+    assert has_too_many_consecutive_tool_calls([], max_calls=0)
+    assert has_too_many_consecutive_tool_calls([HumanMessage(content="Hi")], max_calls=0)
+
+
+def test_filter_empty_content_returns_input_when_nothing_to_fix() -> None:
+    """Test that the common case returns the original list without copying."""
+    messages = [
+        SystemMessage(content="system"),
+        HumanMessage(content="Hello"),
+        AIMessage(content="Hi there"),
+    ]
+
+    assert filter_empty_content_messages(messages) is messages
+
+
+def test_filter_empty_content_fills_in_empty_messages() -> None:
+    """Test that empty or whitespace-only content is replaced without mutating input."""
+    tool_message = ToolMessage(content="", tool_call_id="call_1")
+    ai_message = AIMessage(content="   ")
+    messages = [HumanMessage(content="Hello"), ai_message, tool_message]
+
+    result = filter_empty_content_messages(messages)
+
+    assert [m.content for m in result] == ["Hello", "...", "Completed"]
+    assert isinstance(result[2], ToolMessage)
+    assert result[2].tool_call_id == "call_1"
+    # The originals are left untouched
+    assert ai_message.content == "   "
+    assert tool_message.content == ""
+
+
+def test_process_tool_calls_dispatches_by_name() -> None:
+    """Test that tool calls are routed through the name map, in call order."""
+    tool_calls = [
+        {"name": "echo", "args": {"text": "hi"}, "id": "call_1"},
+        {"name": "missing", "args": {}, "id": "call_2"},
+    ]
+
+    result = process_tool_calls(tool_calls, {"echo": echo})
+
+    assert [m.tool_call_id for m in result] == ["call_1", "call_2"]
+    assert result[0].content == "hi"
+    assert result[1].content == "Tool 'missing' not found"
+
+
+@pytest.mark.anyio
+async def test_aprocess_tool_calls_runs_concurrently_within_limit() -> None:
+    """Test that tool calls run together, bounded by max_concurrency, in call order."""
+    running = 0
+    peak = 0
+
+    @tool
+    async def slow_echo(text: str) -> str:
+        """Echo the given text after a short delay."""
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return text
+
+    tool_calls = [
+        {"name": "slow_echo", "args": {"text": str(i)}, "id": f"call_{i}"}
+        for i in range(5)
+    ]
+    tool_calls.append({"name": "missing", "args": {}, "id": "call_missing"})
+
+    result = await aprocess_tool_calls(tool_calls, {"slow_echo": slow_echo}, max_concurrency=2)
+
+    assert [m.content for m in result] == ["0", "1", "2", "3", "4", "Tool 'missing' not found"]
+    assert [m.tool_call_id for m in result][-1] == "call_missing"
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_aiter_tool_calls_yields_in_completion_order(
+    sleepy: BaseTool, slow_then_fast_calls: list[dict[str, Any]]
+) -> None:
+    """Test that results stream as tools finish while the batch keeps call order."""
+    tool_calls = slow_then_fast_calls
+    tools_map = {"sleepy": sleepy}
+
+    streamed = [(i, m.content) async for i, m in aiter_tool_calls(tool_calls, tools_map)]
+    assert streamed == [(1, "fast"), (0, "slow")]
+
+    seen: list[ToolMessage] = []
+    result = await aprocess_tool_calls(tool_calls, tools_map, on_result=seen.append)
+    assert [m.content for m in seen] == ["fast", "slow"]
+    assert [m.content for m in result] == ["slow", "fast"]
+
+    # Call order is kept even when the ids don't tell the calls apart
+    for tool_call in tool_calls:
+        tool_call["id"] = "x"
+    result = await aprocess_tool_calls(tool_calls, tools_map)
+    assert [m.content for m in result] == ["slow", "fast"]